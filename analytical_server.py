@@ -1,158 +1,377 @@
-from kafka import KafkaConsumer
-from flask import Flask, jsonify, render_template_string
-import json
+from confluent_kafka import Consumer
+from flask import Flask, Response, request, stream_with_context
+import gzip
+import numpy as np
+import orjson
 import threading
 import time
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
+from datetime import datetime
+from collections import namedtuple
+from functools import lru_cache
 import queue
 
+try:
+    from numba import njit
+except ImportError:  # Without numba, apply_batch runs as a plain Python loop
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 app = Flask(__name__)
 
+INITIAL_TYPES = 16  # Rows preallocated for emoji types; doubled when full
+
+def json_response(body):
+    """Wrap pre-serialized JSON bytes in a response without re-encoding"""
+    return app.response_class(body, mimetype='application/json')
+
+def current_epoch_minute():
+    return int(time.time()) // 60
+
+@lru_cache(maxsize=1024)
+def _parse_minute_prefix(prefix):
+    return int(datetime.fromisoformat(prefix).timestamp()) // 60
+
+def epoch_minute_from_iso(timestamp_str):
+    """Epoch minute of an ISO 8601 timestamp; only the 'YYYY-MM-DDTHH:MM' prefix is parsed"""
+    try:
+        return _parse_minute_prefix(timestamp_str[:16])
+    except (TypeError, ValueError):
+        return current_epoch_minute()
+
+def minute_to_datetime(epoch_minute):
+    return datetime.fromtimestamp(epoch_minute * 60)
+
+@njit(cache=True)
+def apply_batch(counts, count_minutes, totals, total_minutes, minutes, type_ids, ring_size, oldest_minute):
+    """Count each (minutes[i], type_ids[i]) event into the ring, lazily zeroing cells that held an older minute"""
+    for i in range(minutes.shape[0]):
+        minute = minutes[i]
+        if minute < oldest_minute:
+            continue  # Too old for the window
+        slot = minute % ring_size
+        type_id = type_ids[i]
+        if count_minutes[type_id, slot] != minute:
+            counts[type_id, slot] = 0
+            count_minutes[type_id, slot] = minute
+        counts[type_id, slot] += 1
+        if total_minutes[slot] != minute:
+            totals[slot] = 0
+            total_minutes[slot] = minute
+        totals[slot] += 1
+
+# Serialized responses published together by the consumer thread
+Snapshot = namedtuple('Snapshot', ['emoji_json', 'emoji_json_gzip', 'total_json', 'chart_json', 'stats_json'])
+
 class EmojiAnalytics:
+    __slots__ = ('window_size', 'ring_size', 'type_ids', 'type_names', 'counts', 'count_minutes',
+                 'totals', 'total_minutes', 'last_minute_epoch', '_live_totals', '_total_emojis',
+                 '_snapshot', '_subscribers', '_subscribers_lock')
+
     def __init__(self, window_size_minutes=3):  # Changed to 3 minutes
         self.window_size = window_size_minutes
-        self.emoji_counts = defaultdict(lambda: deque())  # emoji_type -> [(timestamp, count), ...]
-        self.total_counts = deque()  # [(timestamp, total_count), ...]
-        self.current_minute_counts = defaultdict(int)
-        self.current_minute_total = 0
-        self.last_minute = datetime.now().replace(second=0, microsecond=0)
-        self.lock = threading.Lock()
+        # Ring of per-minute counters: the completed window plus the minute in progress
+        self.ring_size = window_size_minutes + 1
+        self.type_ids = {}  # emoji_type -> row in counts
+        self.type_names = []  # row in counts -> emoji_type
+        self.counts = np.zeros((INITIAL_TYPES, self.ring_size), dtype=np.uint32)  # [type_id, epoch_minute % ring_size]
+        self.count_minutes = np.full((INITIAL_TYPES, self.ring_size), -1, dtype=np.int64)  # epoch minute held by each cell
+        self.totals = np.zeros(self.ring_size, dtype=np.uint32)
+        self.total_minutes = np.full(self.ring_size, -1, dtype=np.int64)
+        self.last_minute_epoch = current_epoch_minute()
+        # Window totals for /api/stats: recounted when a minute completes, incremented per batch
+        self._live_totals = {}
+        self._total_emojis = 0
+        # Only the Kafka consumer thread mutates the counters; it publishes a new
+        # Snapshot with a single attribute store, so request handlers read it without locking.
+        self._snapshot = None
+        # Event queues of /api/stream clients, replaced (never mutated) under the lock
+        self._subscribers = ()
+        self._subscribers_lock = threading.Lock()
+        self._publish_snapshot()
        
-    def add_emoji(self, emoji_type, timestamp_str):
-        try:
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            timestamp = timestamp.replace(tzinfo=None)  # Remove timezone for consistency
-        except:
-            timestamp = datetime.now()
-           
-        current_minute = timestamp.replace(second=0, microsecond=0)
-       
-        with self.lock:
-            # If we've moved to a new minute, save the previous minute's data
-            if current_minute > self.last_minute:
-                self._save_minute_data()
-                self._reset_current_minute()
-                self.last_minute = current_minute
-           
-            # Increment counters for current minute
-            self.current_minute_counts[emoji_type] += 1
-            self.current_minute_total += 1
-   
-    def _save_minute_data(self):
-        timestamp = self.last_minute
-       
-        # Save individual emoji counts
-        for emoji_type, count in self.current_minute_counts.items():
-            self.emoji_counts[emoji_type].append((timestamp, count))
-            # Keep only data within the window
-            cutoff_time = timestamp - timedelta(minutes=self.window_size)
-            while (self.emoji_counts[emoji_type] and
-                   self.emoji_counts[emoji_type][0][0] < cutoff_time):
-                self.emoji_counts[emoji_type].popleft()
-       
-        # Save total count
-        if self.current_minute_total > 0:
-            self.total_counts.append((timestamp, self.current_minute_total))
-            # Keep only data within the window
-            cutoff_time = timestamp - timedelta(minutes=self.window_size)
-            while (self.total_counts and
-                   self.total_counts[0][0] < cutoff_time):
-                self.total_counts.popleft()
-   
-    def _reset_current_minute(self):
-        self.current_minute_counts.clear()
-        self.current_minute_total = 0
+    def type_id(self, emoji_type):
+        """Row of emoji_type in counts, allocated on first sight"""
+        type_id = self.type_ids.get(emoji_type)
+        if type_id is None:
+            type_id = len(self.type_ids)
+            if type_id == self.counts.shape[0]:
+                self.counts = np.vstack((self.counts, np.zeros_like(self.counts)))
+                self.count_minutes = np.vstack((self.count_minutes, np.full_like(self.count_minutes, -1)))
+            self.type_ids[emoji_type] = type_id
+            self.type_names.append(emoji_type)
+        return type_id
+
+    def add_emoji(self, emoji_type, epoch_minute):
+        self.add_emoji_batch(
+            np.array([epoch_minute], dtype=np.int64),
+            np.array([self.type_id(emoji_type)], dtype=np.int32)
+        )
+
+    def add_emoji_batch(self, minutes, type_ids):
+        """Add a batch of events given as parallel epoch-minute and type_id arrays"""
+        newest_minute = max(int(minutes.max()), self.last_minute_epoch)
+        oldest_minute = newest_minute - self.ring_size + 1
+        apply_batch(self.counts, self.count_minutes, self.totals, self.total_minutes,
+                    minutes, type_ids, self.ring_size, oldest_minute)
+
+        in_window = minutes >= oldest_minute
+        if newest_minute > self.last_minute_epoch:
+            self._complete_minute(newest_minute)
+        elif (minutes[in_window] < self.last_minute_epoch).any():
+            # Late events changed a minute that was already published
+            self._publish_snapshot()
+        else:
+            batch_counts = np.bincount(type_ids[in_window]).tolist()
+            for type_id, count in enumerate(batch_counts):
+                if count:
+                    emoji_type = self.type_names[type_id]
+                    self._live_totals[emoji_type] = self._live_totals.get(emoji_type, 0) + count
+                    self._total_emojis += count
+            self._publish_stats()
+
+    def roll_minute_if_stale(self):
+        """Complete the open minute if the wall clock has moved past it without new emojis"""
+        now_minute = current_epoch_minute()
+        if now_minute > self.last_minute_epoch:
+            self._complete_minute(now_minute)
+
+    def subscribe(self):
+        """Queue receiving (event, data) pairs for a stream client"""
+        events = queue.Queue(maxsize=100)
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + (events,)
+        return events
+
+    def unsubscribe(self, events):
+        with self._subscribers_lock:
+            self._subscribers = tuple(q for q in self._subscribers if q is not events)
+
+    def _broadcast(self, event, data):
+        for events in self._subscribers:
+            try:
+                events.put_nowait((event, data))
+            except queue.Full:
+                pass  # Slow client; every event carries full state, so the next one catches it up
+
+    def _complete_minute(self, new_minute):
+        """Open new_minute and publish the snapshot that now includes the finished minute"""
+        self.last_minute_epoch = new_minute
+        self._publish_snapshot()
+
+    def _publish_snapshot(self):
+        self._recount_live_totals()
+        emoji_json = orjson.dumps(self._build_emoji_data())
+        self._snapshot = Snapshot(
+            emoji_json=emoji_json,
+            # Level 1: the repeated timestamps compress well even at the cheapest setting
+            emoji_json_gzip=gzip.compress(emoji_json, compresslevel=1),
+            total_json=orjson.dumps(self._build_total_data()),
+            chart_json=orjson.dumps(self._build_chart_data()),
+            stats_json=self._stats_json()
+        )
+        self._broadcast(b'chart', self._snapshot.chart_json)
+        self._broadcast(b'stats', self._snapshot.stats_json)
+
+    def _publish_stats(self):
+        self._snapshot = self._snapshot._replace(stats_json=self._stats_json())
+        self._broadcast(b'stats', self._snapshot.stats_json)
+
+    def _completed_points(self, cell_minutes, counts):
+        """Data points of the completed minutes in the window, oldest first"""
+        first_minute = self.last_minute_epoch - self.window_size
+        return [
+            {
+                'timestamp': minute_to_datetime(minute),
+                'count': count
+            }
+            for minute, count in sorted(zip(cell_minutes.tolist(), counts.tolist()))
+            if first_minute <= minute < self.last_minute_epoch and count
+        ]
+
+    def _build_emoji_data(self):
+        result = {}
+        for emoji_type, type_id in self.type_ids.items():
+            data_points = self._completed_points(self.count_minutes[type_id], self.counts[type_id])
+            if data_points:
+                result[emoji_type] = data_points
+        return result
+
+    def _build_total_data(self):
+        return self._completed_points(self.total_minutes, self.totals)
+
+    def _build_chart_data(self):
+        """Completed minutes with data, and per-emoji counts aligned on that axis"""
+        minutes = np.arange(self.last_minute_epoch - self.window_size, self.last_minute_epoch)
+        slots = minutes % self.ring_size
+        total = np.where(self.total_minutes[slots] == minutes, self.totals[slots], 0)
+        minutes, slots, total = minutes[total > 0], slots[total > 0], total[total > 0]
+
+        num_types = len(self.type_names)
+        series = np.where(self.count_minutes[:num_types, slots] == minutes,
+                          self.counts[:num_types, slots], 0)
+        return {
+            'labels': [minute_to_datetime(minute) for minute in minutes.tolist()],
+            'total': total.tolist(),
+            'series': {
+                emoji_type: counts
+                for emoji_type, counts in zip(self.type_names, series.tolist())
+                if any(counts)
+            }
+        }
+
+    def _recount_live_totals(self):
+        # Cells holding a minute older than the window are stale, not zeroed
+        first_minute = self.last_minute_epoch - self.window_size
+        num_types = len(self.type_names)
+        in_window = self.count_minutes[:num_types] >= first_minute
+        emoji_sums = np.where(in_window, self.counts[:num_types], 0).sum(axis=1).tolist()
+        self._live_totals = {
+            emoji_type: count
+            for emoji_type, count in zip(self.type_names, emoji_sums)
+            if count
+        }
+        self._total_emojis = int(self.totals[self.total_minutes >= first_minute].sum())
+
+    def _stats_json(self):
+        return orjson.dumps({
+            'total_emojis': self._total_emojis,
+            'emoji_breakdown': self._live_totals,
+            'window_minutes': self.window_size
+        })
    
-    def get_emoji_data(self):
-        with self.lock:
-            # Make sure current minute data is included
-            self._save_minute_data()
-           
-            result = {}
-            for emoji_type, data_points in self.emoji_counts.items():
-                result[emoji_type] = [
-                    {
-                        'timestamp': timestamp.isoformat(),
-                        'count': count
-                    }
-                    for timestamp, count in data_points
-                ]
-            return result
+    def get_emoji_data(self, gzipped=False):
+        """Serialized time-series data per emoji type for completed minutes"""
+        snapshot = self._snapshot
+        return snapshot.emoji_json_gzip if gzipped else snapshot.emoji_json
    
     def get_total_data(self):
-        with self.lock:
-            # Make sure current minute data is included
-            self._save_minute_data()
-           
-            return [
-                {
-                    'timestamp': timestamp.isoformat(),
-                    'count': count
-                }
-                for timestamp, count in self.total_counts
-            ]
+        """Serialized time-series data of total counts for completed minutes"""
+        return self._snapshot.total_json
+   
+    def get_chart_data(self):
+        """Serialized chart payload: labels, totals and per-emoji series on one time axis"""
+        return self._snapshot.chart_json
    
     def get_current_stats(self):
-        with self.lock:
-            total_emojis = sum(count for _, count in self.total_counts) + self.current_minute_total
-            emoji_totals = defaultdict(int)
-           
-            for emoji_type, data_points in self.emoji_counts.items():
-                emoji_totals[emoji_type] = sum(count for _, count in data_points)
-                emoji_totals[emoji_type] += self.current_minute_counts.get(emoji_type, 0)
-           
-            return {
-                'total_emojis': total_emojis,
-                'emoji_breakdown': dict(emoji_totals),
-                'window_minutes': self.window_size
-            }
+        """Serialized window statistics, including the minute in progress"""
+        return self._snapshot.stats_json
 
 # Global analytics instance
 analytics = EmojiAnalytics()
 
 def kafka_consumer_thread():
     """Background thread to consume Kafka messages"""
-    consumer = KafkaConsumer(
-        'emoji_topic',
-        bootstrap_servers='localhost:9092',
-        value_deserializer=lambda x: json.loads(x.decode('utf-8')),
-        group_id='analytics_consumer',
-        auto_offset_reset='latest'
-    )
+    consumer = Consumer({
+        'bootstrap.servers': 'localhost:9092',
+        'group.id': 'analytics_consumer',
+        'auto.offset.reset': 'latest',
+        'enable.auto.commit': False,
+        'fetch.min.bytes': 65536,
+        'fetch.wait.max.ms': 200,
+        'queued.max.messages.kbytes': 65536
+    })
+    consumer.subscribe(['emoji_topic'])
    
     print("Analytics service started - consuming emoji data...")
    
-    for message in consumer:
-        if message.value:
-            emoji_type = message.value.get('emoji_type')
-            timestamp = message.value.get('timestamp')
-            if emoji_type and timestamp:
-                analytics.add_emoji(emoji_type, timestamp)
+    while True:
+        messages = consumer.consume(num_messages=1000, timeout=0.5)
+        minutes = np.empty(len(messages), dtype=np.int64)
+        type_ids = np.empty(len(messages), dtype=np.int32)
+        # Later minutes are bogus timestamps that would push real data out of the window
+        latest_minute = current_epoch_minute() + 1
+        n = 0
+        for message in messages:
+            if message.error():
+                print(f"Kafka consumer error: {message.error()}")
+                continue
+            try:
+                value = orjson.loads(message.value())
+            except orjson.JSONDecodeError:
+                continue
+            if not isinstance(value, dict):
+                continue
+            emoji_type = value.get('emoji_type')
+            if not emoji_type or not isinstance(emoji_type, str):
+                continue
+            timestamp_ms = value.get('timestamp_ms')
+            try:
+                if timestamp_ms is not None:
+                    minute = int(timestamp_ms) // 60000
+                elif value.get('timestamp'):
+                    minute = epoch_minute_from_iso(value['timestamp'])
+                else:
+                    continue
+            except (TypeError, ValueError, OverflowError):
+                continue
+            if not 0 <= minute <= latest_minute:
+                continue
+            minutes[n] = minute
+            type_ids[n] = analytics.type_id(emoji_type)
+            n += 1
+        if n:
+            analytics.add_emoji_batch(minutes[:n], type_ids[:n])
+        if messages:
+            # One offset commit per consumed batch
+            consumer.commit(asynchronous=True)
+        analytics.roll_minute_if_stale()
 
-# Start Kafka consumer in background thread
-consumer_thread = threading.Thread(target=kafka_consumer_thread, daemon=True)
-consumer_thread.start()
+def start_consumer():
+    """Start the Kafka consumer in a background thread of the serving process"""
+    consumer_thread = threading.Thread(target=kafka_consumer_thread, daemon=True)
+    consumer_thread.start()
+    return consumer_thread
 
 @app.route('/api/emoji-data')
 def get_emoji_data():
     """Get time-series data for all emoji types"""
-    return jsonify(analytics.get_emoji_data())
+    gzipped = request.accept_encodings['gzip'] > 0
+    response = json_response(analytics.get_emoji_data(gzipped=gzipped))
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route('/api/total-data')
 def get_total_data():
     """Get time-series data for total emoji count"""
-    return jsonify(analytics.get_total_data())
+    return json_response(analytics.get_total_data())
+
+@app.route('/api/chart')
+def get_chart_data():
+    """Get chart-ready data aligned on a common time axis"""
+    return json_response(analytics.get_chart_data())
 
 @app.route('/api/stats')
 def get_stats():
     """Get current statistics"""
-    return jsonify(analytics.get_current_stats())
+    return json_response(analytics.get_current_stats())
+
+@app.route('/api/stream')
+def stream():
+    """Server-Sent Events: 'stats' after each ingested batch, 'chart' whenever the time series change"""
+    def generate():
+        # Subscribed only once the body is iterated, so the finally clause always unsubscribes
+        events = analytics.subscribe()
+        try:
+            # Current state first, so a (re)connecting client needs no separate fetch
+            yield b'event: chart\ndata: ' + analytics.get_chart_data() + b'\n\n'
+            yield b'event: stats\ndata: ' + analytics.get_current_stats() + b'\n\n'
+            while True:
+                try:
+                    event, data = events.get(timeout=20)
+                    yield b'event: ' + event + b'\ndata: ' + data + b'\n\n'
+                except queue.Empty:
+                    yield b': ping\n\n'
+        finally:
+            analytics.unsubscribe(events)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
 
 @app.route('/')
 def dashboard():
     """Analytics dashboard"""
-    return render_template_string(DASHBOARD_HTML)
+    return app.response_class(DASHBOARD_BYTES, mimetype='text/html')
 
 # HTML template for the analytics dashboard
 DASHBOARD_HTML = '''
@@ -321,6 +540,8 @@ DASHBOARD_HTML = '''
     <script>
         let totalChart, emojiChart;
         let chartJsLoaded = false;
+        // Latest {labels, total, series} chart payload, replaced by each stream 'chart' event
+        let latestChart = { labels: [], total: [], series: {} };
        
         const colors = [
             '#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF',
@@ -436,30 +657,72 @@ DASHBOARD_HTML = '''
             }
         }
 
-        function updateDataTable(totalData, emojiData) {
+        function updateDataTable(chart) {
             const tbody = document.getElementById('dataTableBody');
             tbody.innerHTML = '';
            
-            // Get last 10 data points
-            const recentData = totalData.slice(-10);
-           
-            recentData.forEach(item => {
+            // Last 10 data points; series are aligned with labels, so column i is one minute
+            const series = Object.entries(chart.series);
+            for (let i = Math.max(0, chart.labels.length - 10); i < chart.labels.length; i++) {
                 const row = tbody.insertRow();
-                row.insertCell(0).textContent = new Date(item.timestamp).toLocaleString();
-                row.insertCell(1).textContent = item.count;
-               
-                // Find emoji breakdown for this timestamp
-                let breakdown = [];
-                for (const [emojiType, dataPoints] of Object.entries(emojiData)) {
-                    const point = dataPoints.find(d => d.timestamp === item.timestamp);
-                    if (point && point.count > 0) {
-                        breakdown.push(`${emojiType}: ${point.count}`);
-                    }
-                }
+                row.insertCell(0).textContent = new Date(chart.labels[i]).toLocaleString();
+                row.insertCell(1).textContent = chart.total[i];
+                const breakdown = series
+                    .filter(([, counts]) => counts[i] > 0)
+                    .map(([emojiType, counts]) => `${emojiType}: ${counts[i]}`);
                 row.insertCell(2).textContent = breakdown.join(', ') || 'No data';
+            }
+        }
+
+        function updateStats(stats) {
+            document.getElementById('totalEmojis').textContent = stats.total_emojis;
+            document.getElementById('uniqueTypes').textContent = Object.keys(stats.emoji_breakdown).length;
+            document.getElementById('windowSize').textContent = stats.window_minutes;
+        }
+
+        // Render a {labels, total, series} payload; returns false when charts are disabled
+        function renderChart(chart) {
+            updateDataTable(chart);
+            if (!(chartJsLoaded && totalChart && emojiChart)) {
+                return false;
+            }
+            const labels = chart.labels.map(t => new Date(t).toLocaleTimeString());
+
+            totalChart.data.labels = labels;
+            totalChart.data.datasets[0].data = chart.total;
+            totalChart.update();
+
+            emojiChart.data.labels = labels;
+            emojiChart.data.datasets = Object.entries(chart.series).map(([emoji, counts], index) => ({
+                label: emoji,
+                data: counts,
+                borderColor: colors[index % colors.length],
+                backgroundColor: colors[index % colors.length] + '20',
+                fill: false,
+                tension: 0.4
+            }));
+            emojiChart.update();
+            return true;
+        }
+
+        function connectStream() {
+            const source = new EventSource('/api/stream');
+            source.addEventListener('stats', event => updateStats(JSON.parse(event.data)));
+            source.addEventListener('chart', event => {
+                latestChart = JSON.parse(event.data);
+                renderChart(latestChart);
             });
+            source.onopen = () => {
+                document.getElementById('status').textContent = 'Live updates connected';
+                document.getElementById('status').className = 'success';
+            };
+            source.onerror = () => {
+                // EventSource reconnects on its own
+                document.getElementById('status').textContent = 'Live updates interrupted, reconnecting...';
+                document.getElementById('status').className = 'error';
+            };
         }
-       
+
         async function refreshData() {
             try {
                 document.getElementById('status').textContent = 'Fetching data...';
@@ -468,50 +731,15 @@ DASHBOARD_HTML = '''
                 // Fetch stats
                 const statsResponse = await fetch('/api/stats');
                 const stats = await statsResponse.json();
-               
-                document.getElementById('totalEmojis').textContent = stats.total_emojis;
-                document.getElementById('uniqueTypes').textContent = Object.keys(stats.emoji_breakdown).length;
-                document.getElementById('windowSize').textContent = stats.window_minutes;
-               
-                // Fetch total data
-                const totalResponse = await fetch('/api/total-data');
-                const totalData = await totalResponse.json();
-               
-                // Fetch emoji data
-                const emojiResponse = await fetch('/api/emoji-data');
-                const emojiData = await emojiResponse.json();
-
-                // Update data table
-                updateDataTable(totalData, emojiData);
-
-                console.log('Data fetched:', { totalData, emojiData, stats });
-
-                if (chartJsLoaded && totalChart && emojiChart) {
-                    // Update total chart
-                    totalChart.data.labels = totalData.map(d => new Date(d.timestamp).toLocaleTimeString());
-                    totalChart.data.datasets[0].data = totalData.map(d => d.count);
-                    totalChart.update();
-                   
-                    // Update emoji chart
-                    const emojiTypes = Object.keys(emojiData);
-                    const allTimestamps = [...new Set(
-                        Object.values(emojiData).flat().map(d => d.timestamp)
-                    )].sort();
-                   
-                    emojiChart.data.labels = allTimestamps.map(t => new Date(t).toLocaleTimeString());
-                    emojiChart.data.datasets = emojiTypes.map((emoji, index) => ({
-                        label: emoji,
-                        data: allTimestamps.map(timestamp => {
-                            const dataPoint = emojiData[emoji].find(d => d.timestamp === timestamp);
-                            return dataPoint ? dataPoint.count : 0;
-                        }),
-                        borderColor: colors[index % colors.length],
-                        backgroundColor: colors[index % colors.length] + '20',
-                        fill: false,
-                        tension: 0.4
-                    }));
-                    emojiChart.update();
+                updateStats(stats);
+
+                // Fetch chart data, already aligned on a common time axis by the server
+                const chartResponse = await fetch('/api/chart');
+                latestChart = await chartResponse.json();
 
+                console.log('Data fetched:', { chart: latestChart, stats });
+
+                if (renderChart(latestChart)) {
                     document.getElementById('status').textContent = 'Data updated successfully!';
                     document.getElementById('status').className = 'success';
                 } else {
@@ -538,8 +766,8 @@ DASHBOARD_HTML = '''
             // Initial data load
             await refreshData();
            
-            // Auto-refresh every 10 seconds
-            setInterval(refreshData, 10000);
+            // Live updates pushed by the server
+            connectStream();
         }
 
         // Start initialization when page loads
@@ -549,11 +777,17 @@ DASHBOARD_HTML = '''
 </html>
 '''
 
+# The dashboard has no template variables, so it is encoded once instead of rendered per request
+DASHBOARD_BYTES = DASHBOARD_HTML.encode('utf-8')
+
 if __name__ == '__main__':
     print("Starting Emoji Analytics Service...")
     print("Dashboard available at: http://localhost:5002")
     print("API endpoints:")
     print("  /api/emoji-data - Time-series data by emoji type")
     print("  /api/total-data - Total emoji count over time")
+    print("  /api/chart - Chart-ready series on a common time axis")
     print("  /api/stats - Current statistics")
-    app.run(port=5002, debug=True, threaded=True)
+    print("  /api/stream - Server-Sent Events with live updates")
+    start_consumer()
+    app.run(port=5002, debug=False, threaded=True)
@@ -0,0 +1,15 @@
+# Gunicorn settings for the analytics dashboard: gunicorn analytical_server:app
+bind = "0.0.0.0:5002"
+
+# Analytics state lives in process memory and is fed by one Kafka consumer,
+# so a single worker serves every request; threads give request concurrency.
+workers = 1
+worker_class = "gthread"
+# Each open dashboard holds one thread for /api/stream for as long as it stays open;
+# with 32 tabs open no thread is left for other requests (see README).
+threads = 32
+
+def post_worker_init(worker):
+    # Started after fork so the consumer thread runs inside the serving worker
+    from analytical_server import start_consumer
+    start_consumer()